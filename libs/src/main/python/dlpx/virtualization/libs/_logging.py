@@ -2,13 +2,18 @@
 # Copyright (c) 2019, 2021 by Delphix. All rights reserved.
 #
 
+import logging
+import threading
 from logging import Handler
+from logging.handlers import BufferingHandler
 
 from dlpx.virtualization.libs import libs
-from dlpx.virtualization.common.util import to_str
+from six.moves import queue
 
 __all__ = [
-    "PlatformHandler"
+    "PlatformHandler",
+    "BufferedPlatformHandler",
+    "AsyncPlatformHandler"
 ]
 
 
@@ -18,5 +23,142 @@ class PlatformHandler(Handler):
     """
     def emit(self, record):
         msg = self.format(record)
-        msg = to_str(msg)
         libs._log_request(msg, record.levelno)
+
+
+class BufferedPlatformHandler(BufferingHandler):
+    """
+    A logging handler that formats records as they are logged, buffers them
+    and hands them to the Virtualization Library in batches.
+
+    Buffered records are sent when the buffer reaches capacity, when a record
+    at or above flush_level is logged, or when the handler is flushed or
+    closed. Consecutive records that map to the same library logging level are
+    sent in a single library call, joined by newlines, so those records are
+    merged into one platform log entry.
+
+    Args:
+        capacity (int): The number of records to buffer before flushing.
+        flush_level (int): The Python logging level that forces a flush.
+    """
+    def __init__(self, capacity=100, flush_level=logging.ERROR):
+        BufferingHandler.__init__(self, capacity)
+        self.flush_level = flush_level
+
+    def shouldFlush(self, record):
+        return (len(self.buffer) >= self.capacity or
+                record.levelno >= self.flush_level)
+
+    def emit(self, record):
+        # Format now, so the message shows the record's arguments as they were
+        # when it was logged rather than when the buffer is flushed.
+        self.buffer.append((self.format(record), record.levelno))
+        if self.shouldFlush(record):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            entries = self.buffer
+            self.buffer = []
+            if entries:
+                libs._log_batch_request(entries)
+        finally:
+            self.release()
+
+
+class AsyncPlatformHandler(PlatformHandler):
+    """
+    A logging handler that calls into the Virtualization Library from a
+    background thread, so that logging code does not wait on the engine.
+
+    Records are formatted on the calling thread and queued. Records at or above
+    logging.ERROR are logged on the calling thread once everything queued
+    before them has been logged. Flushing the handler waits for the queued
+    records to be logged. Closing it does the same and then stops the
+    background thread.
+
+    Args:
+        maxsize (int): The number of records that can be queued. Logging blocks
+            while the queue is full.
+    """
+    def __init__(self, maxsize=1000):
+        PlatformHandler.__init__(self)
+        self._executor = _OneWayExecutor(maxsize)
+
+    def emit(self, record):
+        msg = self.format(record)
+        if record.levelno >= logging.ERROR:
+            self._executor.flush()
+            libs._log_request(msg, record.levelno)
+        else:
+            self._executor.submit(self._log, msg, record)
+
+    def _log(self, msg, record):
+        try:
+            libs._log_request(msg, record.levelno)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self._executor.flush()
+
+    def close(self):
+        try:
+            self._executor.close()
+        finally:
+            PlatformHandler.close(self)
+
+
+#
+# Queued by _OneWayExecutor.close() to make its thread return.
+#
+_STOP = object()
+
+
+class _OneWayExecutor(object):
+    """
+    Runs calls whose results are not needed on a single daemon thread, in the
+    order they were submitted. The thread is started by the first submit and
+    stopped by close. A submit after close starts a new thread.
+    """
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, func, *args):
+        # The call is queued under the lock so that it cannot end up behind
+        # the _STOP of a concurrent close, where no thread would run it.
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            self._queue.put((func, args))
+
+    def flush(self):
+        """Blocks until every submitted call has run."""
+        self._queue.join()
+
+    def close(self):
+        """Blocks until every submitted call has run, then stops the
+        thread."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._thread = None
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                func, args = item
+                func(*args)
+            finally:
+                self._queue.task_done()
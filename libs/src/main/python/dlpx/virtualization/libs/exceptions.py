@@ -61,16 +61,20 @@ class IncorrectArgumentTypeError(PluginRuntimeError):
             for the parameter
         expected_type (Type): The type of the parameter that is expected.
         required (bool): If the parameter is required (doesn't have a default)
+        func_name (str): The name of the library function to report. Defaults
+            to the name of the function that raises this error.
 
     Attributes:
         message (str): A user-readable message describing the exception.
     """
 
-    def __init__(self, parameter_name, actual_type, expected_type, required=True):
+    def __init__(self, parameter_name, actual_type, expected_type, required=True,
+                 func_name=None):
         actual, expected = self.get_actual_and_expected_type(actual_type, expected_type)
 
         # Get the name of the function that is throwing this error.
-        func_name = sys._getframe(1).f_code.co_name
+        if func_name is None:
+            func_name = sys._getframe(1).f_code.co_name
         message = ("The function {}'s argument '{}' was {} but should"
                    " be of {}{}.".format(
                         func_name,
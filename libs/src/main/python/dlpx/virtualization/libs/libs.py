@@ -25,6 +25,8 @@ of a lib operation.
 """
 
 import sys
+import threading
+import weakref
 
 from dlpx.virtualization.api import libs_pb2
 from dlpx.virtualization.libs.exceptions import (IncorrectArgumentTypeError,
@@ -46,10 +48,72 @@ __all__ = [
     "run_sync",
     "run_powershell",
     "run_expect",
+    "RemoteShell",
     "retrieve_credentials",
     "upgrade_password"
 ]
 
+#
+# The request classes of the frequently called wrappers are bound once here
+# rather than looked up on libs_pb2 for every call.
+#
+_RunBashRequest = libs_pb2.RunBashRequest
+_RunSyncRequest = libs_pb2.RunSyncRequest
+_RunPowerShellRequest = libs_pb2.RunPowerShellRequest
+_RunExpectRequest = libs_pb2.RunExpectRequest
+_LogRequest = libs_pb2.LogRequest
+
+
+#
+# The engine injects dlpx.virtualization._engine.libs into the runtime, so it
+# only resolves once the plugin is running. The first call imports it, which
+# also binds it on the _engine package, and caches the package. The libs
+# attribute is still read on every call so that unit tests can patch
+# dlpx.virtualization._engine.libs as a whole.
+#
+_engine = None
+
+
+def _get_internal_libs():
+    """Returns the Virtualization Libs interface injected by the engine."""
+    global _engine
+    if _engine is None:
+        from dlpx.virtualization._engine import libs  # noqa: F401
+        _engine = sys.modules['dlpx.virtualization._engine']
+    return _engine.libs
+
+
+#
+# The message returned by to_proto() for a RemoteConnection is kept for as long
+# as the object is alive and copied into the requests of every call with that
+# connection. RemoteConnection and its user and host only have read-only
+# properties, but RemoteEnvironment.host is a plain attribute that plugins can
+# reassign. Each entry therefore also holds the host the message was built
+# from, and the message is built again once the environment has a new host.
+#
+_connection_protos = weakref.WeakKeyDictionary()
+
+
+def _attach_connection(connection, remote_connection):
+    """Fills in a request's remote_connection field from a RemoteConnection.
+
+    RemoteConnection.to_proto() is the only source of the connection's
+    fields. The resulting message is cached, so later calls with the same
+    RemoteConnection, and the same host, only copy it in.
+
+    Args:
+        connection (common_pb2.RemoteConnection): The remote_connection field
+            of a request.
+        remote_connection (RemoteConnection): Connection to a remote
+            environment.
+    """
+    host = remote_connection.environment.host
+    cached = _connection_protos.get(remote_connection)
+    if cached is None or cached[0] is not host:
+        cached = (host, remote_connection.to_proto())
+        _connection_protos[remote_connection] = cached
+    connection.CopyFrom(cached[1])
+
 
 def _handle_response(response):
     """This function handles callback responses. It proceeds differently based
@@ -96,6 +160,123 @@ def _check_exit_code(response, check):
                                       response.return_value.stderr))
 
 
+def _validate_remote_connection(func_name, remote_connection):
+    """Raises IncorrectArgumentTypeError, naming func_name, if
+    remote_connection is not a RemoteConnection."""
+    if not isinstance(remote_connection, RemoteConnection):
+        raise IncorrectArgumentTypeError(
+            'remote_connection',
+            type(remote_connection),
+            RemoteConnection,
+            func_name=func_name)
+
+
+def _validate_command(func_name, command, variables):
+    """Raises IncorrectArgumentTypeError, naming func_name, if command is not a
+    string or variables is not a dict of strings to strings."""
+    if not isinstance(command, six.string_types):
+        raise IncorrectArgumentTypeError(
+            'command', type(command), six.string_types[0],
+            func_name=func_name)
+    if variables and not isinstance(variables, dict):
+        raise IncorrectArgumentTypeError(
+            'variables',
+            type(variables),
+            {six.string_types[0]: six.string_types[0]},
+            False,
+            func_name=func_name)
+    if (variables and not all(isinstance(variable, six.string_types) and
+                              isinstance(value, six.string_types)
+                              for variable, value in six.iteritems(variables))):
+        raise IncorrectArgumentTypeError(
+            'variables',
+            {(type(variable), type(value))
+             for variable, value in variables.items()},
+            {six.string_types[0]: six.string_types[0]},
+            False,
+            func_name=func_name)
+
+
+def _run_bash(func_name, run_bash_request, command, variables,
+              use_login_shell, check):
+    """Runs a RunBashRequest whose remote_connection is already filled in.
+
+    This is the body shared by run_bash and RemoteShell.bash. The other
+    arguments are those of run_bash, and argument errors name func_name.
+    """
+    internal_libs = _get_internal_libs()
+    command = to_str(command)
+    variables = to_str(variables)
+
+    # Validate all the arguments passed in are the right types based on docs.
+    _validate_command(func_name, command, variables)
+    if use_login_shell and not isinstance(use_login_shell, bool):
+        raise IncorrectArgumentTypeError(
+            'use_login_shell', type(use_login_shell), bool, False,
+            func_name=func_name)
+
+    run_bash_request.command = command
+    # Falsy values such as None are accepted above and mean False.
+    run_bash_request.use_login_shell = bool(use_login_shell)
+    if variables:
+        run_bash_request.variables.update(variables)
+
+    run_bash_response = internal_libs.run_bash(run_bash_request)
+    response_to_str(run_bash_response)
+    _check_exit_code(run_bash_response, check)
+    return _handle_response(run_bash_response)
+
+
+def _run_powershell(func_name, run_powershell_request, command, variables,
+                    check):
+    """Runs a RunPowerShellRequest whose remote_connection is already filled
+    in.
+
+    This is the body shared by run_powershell and RemoteShell.powershell. The
+    other arguments are those of run_powershell, and argument errors name
+    func_name.
+    """
+    internal_libs = _get_internal_libs()
+    command = to_str(command)
+    variables = to_str(variables)
+
+    # Validate all the arguments passed in are the right types based on docs.
+    _validate_command(func_name, command, variables)
+
+    run_powershell_request.command = command
+    if variables:
+        run_powershell_request.variables.update(variables)
+
+    run_powershell_response = internal_libs.run_powershell(
+        run_powershell_request)
+    response_to_str(run_powershell_response)
+    _check_exit_code(run_powershell_response, check)
+    return _handle_response(run_powershell_response)
+
+
+def _run_expect(func_name, run_expect_request, command, variables, check):
+    """Runs a RunExpectRequest whose remote_connection is already filled in.
+
+    This is the body shared by run_expect and RemoteShell.expect. The other
+    arguments are those of run_expect, and argument errors name func_name.
+    """
+    internal_libs = _get_internal_libs()
+    command = to_str(command)
+    variables = to_str(variables)
+
+    # Validate all the arguments passed in are the right types based on docs.
+    _validate_command(func_name, command, variables)
+
+    run_expect_request.command = command
+    if variables:
+        run_expect_request.variables.update(variables)
+
+    run_expect_response = internal_libs.run_expect(run_expect_request)
+    response_to_str(run_expect_response)
+    _check_exit_code(run_expect_response, check)
+    return _handle_response(run_expect_response)
+
+
 def run_bash(remote_connection, command, variables=None, use_login_shell=False,
              check=False):
     """run_bash operation wrapper.
@@ -123,56 +304,12 @@ def run_bash(remote_connection, command, variables=None, use_login_shell=False,
     Returns:
         RunBashResponse: The return value of run_bash operation.
     """
-    #
-    # Since this import only resolves at runtime, we keep it in the function
-    # scope to allow unit testing of this module.
-    #
-    from dlpx.virtualization._engine import libs as internal_libs
-
-    if variables is None:
-        variables = {}
-    command = to_str(command)
-    variables = to_str(variables)
+    _validate_remote_connection('run_bash', remote_connection)
 
-    # Validate all the arguments passed in are the right types based on docs.
-    if not isinstance(remote_connection, RemoteConnection):
-        raise IncorrectArgumentTypeError(
-            'remote_connection',
-            type(remote_connection),
-            RemoteConnection)
-    if not isinstance(command, six.string_types):
-        raise IncorrectArgumentTypeError('command', type(command), six.string_types[0])
-    if variables and not isinstance(variables, dict):
-        raise IncorrectArgumentTypeError(
-            'variables',
-            type(variables),
-            {six.string_types[0]: six.string_types[0]},
-            False)
-    if (variables and (not all(isinstance(variable, six.string_types)
-                               for variable in variables.keys()) or
-                       not all(isinstance(value, six.string_types)
-                               for value in variables.values()))):
-        raise IncorrectArgumentTypeError(
-            'variables',
-            {(type(variable), type(value))
-             for variable, value in variables.items()},
-            {six.string_types[0]: six.string_types[0]},
-            False)
-    if use_login_shell and not isinstance(use_login_shell, bool):
-        raise IncorrectArgumentTypeError(
-            'use_login_shell', type(use_login_shell), bool, False)
-
-    run_bash_request = libs_pb2.RunBashRequest()
-    run_bash_request.remote_connection.CopyFrom(remote_connection.to_proto())
-    run_bash_request.command = command
-    run_bash_request.use_login_shell = use_login_shell
-    for variable, value in variables.items():
-        run_bash_request.variables[variable] = value
-
-    run_bash_response = internal_libs.run_bash(run_bash_request)
-    response_to_str(run_bash_response)
-    _check_exit_code(run_bash_response, check)
-    return _handle_response(run_bash_response)
+    run_bash_request = _RunBashRequest()
+    _attach_connection(run_bash_request.remote_connection, remote_connection)
+    return _run_bash('run_bash', run_bash_request, command, variables,
+                     use_login_shell, check)
 
 
 def run_sync(remote_connection, source_directory, rsync_user=None,
@@ -190,13 +327,7 @@ def run_sync(remote_connection, source_directory, rsync_user=None,
         exclude_paths (list of str): Paths to be excluded.
         sym_links_to_follow (list of str): Sym links to follow if any.
     """
-
-    #
-    # Since this import only resolves at runtime, we keep it in the function
-    # scope to allow unit testing of this module.
-    #
-
-    from dlpx.virtualization._engine import libs as internal_libs
+    internal_libs = _get_internal_libs()
 
     source_directory = to_str(source_directory)
     if rsync_user is not None:
@@ -207,11 +338,7 @@ def run_sync(remote_connection, source_directory, rsync_user=None,
         sym_links_to_follow = to_str(sym_links_to_follow)
 
     # Validate all the arguments passed in are the right types based on docs.
-    if not isinstance(remote_connection, RemoteConnection):
-        raise IncorrectArgumentTypeError(
-            'remote_connection',
-            type(remote_connection),
-            RemoteConnection)
+    _validate_remote_connection('run_sync', remote_connection)
     if not isinstance(source_directory, six.string_types):
         raise IncorrectArgumentTypeError(
             'source_directory', type(source_directory), six.string_types[0])
@@ -248,15 +375,15 @@ def run_sync(remote_connection, source_directory, rsync_user=None,
             [six.string_types[0]],
             False)
 
-    run_sync_request = libs_pb2.RunSyncRequest()
-    run_sync_request.remote_connection.CopyFrom(remote_connection.to_proto())
-    run_sync_request.source_directory = source_directory
+    fields = {'source_directory': source_directory}
     if rsync_user is not None:
-        run_sync_request.rsync_user = rsync_user
-    if exclude_paths is not None:
-        run_sync_request.exclude_paths.extend(exclude_paths)
-    if sym_links_to_follow is not None:
-        run_sync_request.sym_links_to_follow.extend(sym_links_to_follow)
+        fields['rsync_user'] = rsync_user
+    if exclude_paths:
+        fields['exclude_paths'] = exclude_paths
+    if sym_links_to_follow:
+        fields['sym_links_to_follow'] = sym_links_to_follow
+    run_sync_request = _RunSyncRequest(**fields)
+    _attach_connection(run_sync_request.remote_connection, remote_connection)
 
     response = internal_libs.run_sync(run_sync_request)
     response_to_str(response)
@@ -288,53 +415,13 @@ def run_powershell(remote_connection, command, variables=None, check=False):
     Returns:
         RunPowerShellResponse: The return value of run_powershell operation.
     """
-    #
-    # Since this import only resolves at runtime, we keep it in the function
-    # scope to allow unit testing of this module.
-    #
-    from dlpx.virtualization._engine import libs as internal_libs
+    _validate_remote_connection('run_powershell', remote_connection)
 
-    if variables is None:
-        variables = {}
-
-    command = to_str(command)
-    variables = to_str(variables)
-
-    # Validate all the arguments passed in are the right types based on docs.
-    if not isinstance(remote_connection, RemoteConnection):
-        raise IncorrectArgumentTypeError(
-            'remote_connection',
-            type(remote_connection),
-            RemoteConnection)
-    if not isinstance(command, six.string_types):
-        raise IncorrectArgumentTypeError('command', type(command), six.string_types[0])
-    if variables and not isinstance(variables, dict):
-        raise IncorrectArgumentTypeError(
-            'variables',
-            type(variables),
-            {six.string_types[0]: six.string_types[0]},
-            False)
-    if (variables and (not all(isinstance(variable, six.string_types)
-                               for variable in variables.keys()) or
-                       not all(isinstance(value, six.string_types)
-                               for value in variables.values()))):
-        raise IncorrectArgumentTypeError(
-            'variables',
-            {(type(variable), type(value))
-             for variable, value in variables.items()},
-            {six.string_types[0]: six.string_types[0]},
-            False)
-
-    run_powershell_request = libs_pb2.RunPowerShellRequest()
-    run_powershell_request.remote_connection.CopyFrom(remote_connection.to_proto())
-    run_powershell_request.command = command
-    for variable, value in variables.items():
-        run_powershell_request.variables[variable] = value
-    run_powershell_response = internal_libs.run_powershell(
-        run_powershell_request)
-    response_to_str(run_powershell_response)
-    _check_exit_code(run_powershell_response, check)
-    return _handle_response(run_powershell_response)
+    run_powershell_request = _RunPowerShellRequest()
+    _attach_connection(run_powershell_request.remote_connection,
+                       remote_connection)
+    return _run_powershell('run_powershell', run_powershell_request, command,
+                           variables, check)
 
 
 def run_expect(remote_connection, command, variables=None, check=False):
@@ -357,57 +444,117 @@ def run_expect(remote_connection, command, variables=None, check=False):
         variables (dict): Environment variables to set before running the
         command.
     """
-    #
-    # Since this import only resolves at runtime, we keep it in the function
-    # scope to allow unit testing of this module.
-    #
-    from dlpx.virtualization._engine import libs as internal_libs
-    if variables is None:
-        variables = {}
+    _validate_remote_connection('run_expect', remote_connection)
 
-    command = to_str(command)
-    variables = to_str(variables)
+    run_expect_request = _RunExpectRequest()
+    _attach_connection(run_expect_request.remote_connection, remote_connection)
+    return _run_expect('run_expect', run_expect_request, command, variables,
+                       check)
 
-    # Validate all the arguments passed in are the right types based on docs.
-    if not isinstance(remote_connection, RemoteConnection):
-        raise IncorrectArgumentTypeError(
-            'remote_connection',
-            type(remote_connection),
-            RemoteConnection)
-    if not isinstance(command, six.string_types):
-        raise IncorrectArgumentTypeError('command', type(command), six.string_types[0])
-    if variables and not isinstance(variables, dict):
-        raise IncorrectArgumentTypeError(
-            'variables',
-            type(variables),
-            {six.string_types[0]: six.string_types[0]},
-            False)
-    if (variables and (not all(isinstance(variable, six.string_types)
-                               for variable in variables.keys()) or
-                       not all(isinstance(value, six.string_types)
-                               for value in variables.values()))):
-        raise IncorrectArgumentTypeError(
-            'variables',
-            {(type(variable), type(value))
-             for variable, value in variables.items()},
-            {six.string_types[0]: six.string_types[0]},
-            False)
 
-    run_expect_request = libs_pb2.RunExpectRequest()
-    run_expect_request.remote_connection.CopyFrom(remote_connection.to_proto())
-    run_expect_request.command = command
-    for variable, value in variables.items():
-        run_expect_request.variables[variable] = value
+class RemoteShell(object):
+    """Runs commands on a single remote environment.
 
-    run_expect_response = internal_libs.run_expect(run_expect_request)
-    response_to_str(run_expect_response)
-    _check_exit_code(run_expect_response, check)
-    return _handle_response(run_expect_response)
+    A RemoteShell keeps one request of each kind with the remote connection
+    already filled in, and reuses it for every call, so the connection is only
+    converted once for the lifetime of the object. Changes made to the
+    connection afterwards, such as a new host for its environment, are not
+    seen by the RemoteShell. The bash, powershell and expect methods otherwise
+    behave exactly like run_bash, run_powershell and run_expect.
 
+    Since the requests are reused, a RemoteShell must not be shared between
+    threads.
 
-def _log_request(message, log_level):
-    """This is an internal wrapper around the Virtualization library's logging
-    API. It maps Python logging level to the library's logging levels:
+    Args:
+        remote_connection (RemoteConnection): Connection to a remote
+        environment.
+    """
+    def __init__(self, remote_connection):
+        _validate_remote_connection('RemoteShell', remote_connection)
+        self._remote_connection = remote_connection
+        self._run_bash_request = _RunBashRequest()
+        _attach_connection(self._run_bash_request.remote_connection,
+                           remote_connection)
+        self._run_powershell_request = _RunPowerShellRequest()
+        _attach_connection(self._run_powershell_request.remote_connection,
+                           remote_connection)
+        self._run_expect_request = _RunExpectRequest()
+        _attach_connection(self._run_expect_request.remote_connection,
+                           remote_connection)
+
+    @property
+    def remote_connection(self):
+        return self._remote_connection
+
+    def bash(self, command, variables=None, use_login_shell=False,
+             check=False):
+        """Runs a bash command or script. See run_bash.
+
+        Args:
+            command (str): Bash command to run.
+            variables (dict of str:str): Environment variables to set before
+            running the command.
+            use_login_shell (bool): Whether to use login shell.
+            check (bool): if True and non-zero exitcode is received, raise
+            PluginScriptError
+
+        Returns:
+            RunBashResponse: The return value of run_bash operation.
+        """
+        run_bash_request = self._run_bash_request
+        # Drop the variables of the previous call.
+        run_bash_request.variables.clear()
+        return _run_bash('RemoteShell.bash', run_bash_request, command,
+                         variables, use_login_shell, check)
+
+    def powershell(self, command, variables=None, check=False):
+        """Runs a powershell command or script. See run_powershell.
+
+        Args:
+            command (str): Powershell script to run.
+            variables (dict): Environment variables to set before running the
+            command.
+            check (bool): if True and non-zero exitcode is received, raise
+            PluginScriptError
+
+        Returns:
+            RunPowerShellResponse: The return value of run_powershell
+            operation.
+        """
+        run_powershell_request = self._run_powershell_request
+        # Drop the variables of the previous call.
+        run_powershell_request.variables.clear()
+        return _run_powershell('RemoteShell.powershell', run_powershell_request,
+                               command, variables, check)
+
+    def expect(self, command, variables=None, check=False):
+        """Runs an expect (TCL) command or script. See run_expect.
+
+        Args:
+            command (str): Expect(TCL) command to run.
+            variables (dict): Environment variables to set before running the
+            command.
+            check (bool): if True and non-zero exitcode is received, raise
+            PluginScriptError
+        """
+        run_expect_request = self._run_expect_request
+        # Drop the variables of the previous call.
+        run_expect_request.variables.clear()
+        return _run_expect('RemoteShell.expect', run_expect_request, command,
+                           variables, check)
+
+
+#
+# The library's logging levels are bound once here rather than looked up on the
+# LogRequest class for every log call.
+#
+_LOG_LEVEL_DEBUG = _LogRequest.DEBUG
+_LOG_LEVEL_INFO = _LogRequest.INFO
+_LOG_LEVEL_ERROR = _LogRequest.ERROR
+
+
+def _to_library_log_level(log_level):
+    """Maps a Python logging level to one of the library's logging levels:
 
     logging.DEBUG    -> LogRequest.DEBUG
     logging.INFO     -> LogRequest.INFO
@@ -417,31 +564,105 @@ def _log_request(message, log_level):
     logging.CRITICAL -> LogRequest.ERROR
 
     Args:
-        message (str): The message to be logged by the platform.
         log_level (int): The Python logging level.
     """
-    from dlpx.virtualization._engine import libs as internal_libs
-
-    message = to_str(message)
-    log_request = libs_pb2.LogRequest()
-    log_request.message = message
-
     #
     # The Virtualization Library API defines only DEBUG, INFO, and ERROR. Map
     # all logging levels into one of those three buckets.
     #
     if log_level <= logging.DEBUG:
-        log_request.level = libs_pb2.LogRequest.DEBUG
+        return _LOG_LEVEL_DEBUG
     elif log_level <= logging.INFO:
-        log_request.level = libs_pb2.LogRequest.INFO
+        return _LOG_LEVEL_INFO
     else:
-        log_request.level = libs_pb2.LogRequest.ERROR
+        return _LOG_LEVEL_ERROR
+
+
+#
+# Each thread reuses a single LogRequest rather than allocating one for every
+# log call. This is safe because the engine has finished with the request by
+# the time log() returns, and every field is overwritten before the next call.
+#
+_log_request_local = threading.local()
+
+
+def _get_log_request():
+    """Returns the calling thread's reusable LogRequest."""
+    log_request = getattr(_log_request_local, 'log_request', None)
+    if log_request is None:
+        log_request = _LogRequest()
+        _log_request_local.log_request = log_request
+    return log_request
+
+
+#
+# _log_request is on the path of every log record, so the module-level helpers
+# it uses are bound as defaults to make them local lookups. Callers must only
+# pass message and log_level. Since the helpers are bound when the module is
+# loaded, patching one of them on this module, e.g. libs._get_internal_libs,
+# does not affect _log_request; patch dlpx.virtualization._engine.libs
+# instead.
+#
+def _log_request(message, log_level,
+                 _to_library_log_level=_to_library_log_level,
+                 _get_internal_libs=_get_internal_libs,
+                 _get_log_request=_get_log_request,
+                 to_str=to_str,
+                 response_to_str=response_to_str,
+                 _handle_response=_handle_response):
+    """This is an internal wrapper around the Virtualization library's logging
+    API. The Python logging level is mapped to the library's logging levels by
+    _to_library_log_level.
+
+    Args:
+        message (str): The message to be logged by the platform.
+        log_level (int): The Python logging level.
+    """
+    internal_libs = _get_internal_libs()
+
+    message = to_str(message)
+    log_request = _get_log_request()
+    log_request.message = message
+    log_request.level = _to_library_log_level(log_level)
 
     response = internal_libs.log(log_request)
     response_to_str(response)
     _handle_response(response)
 
 
+def _log_batch_request(entries):
+    """This is an internal wrapper around the Virtualization library's logging
+    API that logs several messages with as few library calls as possible.
+
+    The library logs one message per call, so consecutive messages that map to
+    the same library logging level are joined with newlines and sent as a
+    single LogRequest.
+
+    Args:
+        entries (list of (str, int)): The messages to be logged by the platform
+            along with their Python logging levels, in the order they were
+            logged.
+    """
+    internal_libs = _get_internal_libs()
+
+    batches = []
+    for message, log_level in entries:
+        level = _to_library_log_level(log_level)
+        if batches and batches[-1][0] == level:
+            batches[-1][1].append(to_str(message))
+        else:
+            batches.append((level, [to_str(message)]))
+
+    log_request = _get_log_request()
+    for level, messages in batches:
+        log_request.message = '\n'.join(messages)
+        log_request.level = level
+
+        response = internal_libs.log(log_request)
+        response_to_str(response)
+        _handle_response(response)
+
+
 def retrieve_credentials(credentials_supplier):
     """
     This is an internal wrapper around the Virtualization library's credentials
@@ -454,7 +675,7 @@ def retrieve_credentials(credentials_supplier):
         Subclass of Credentials retrieved from supplier. Either a PasswordCredentials
         or a KeyPairCredentials from dlpx.virtualization.common._common_classes.
     """
-    from dlpx.virtualization._engine import libs as internal_libs
+    internal_libs = _get_internal_libs()
 
     if not isinstance(credentials_supplier, dict):
         raise IncorrectArgumentTypeError(
@@ -490,7 +711,7 @@ def upgrade_password(password, username=None):
     Return:
         Credentials supplier (dict) that supplies the given password and username.
     """
-    from dlpx.virtualization._engine import libs as internal_libs
+    internal_libs = _get_internal_libs()
 
     if not isinstance(password, six.string_types):
         raise IncorrectArgumentTypeError(
@@ -499,8 +720,8 @@ def upgrade_password(password, username=None):
         raise IncorrectArgumentTypeError(
             'username', type(username), six.string_types[0], required=False)
 
-    upgrade_password_request = libs_pb2.UpgradePasswordRequest()
-    upgrade_password_request.password = password
+    upgrade_password_request = libs_pb2.UpgradePasswordRequest(
+        password=password)
     if username:
         upgrade_password_request.username = username
 
@@ -2,12 +2,17 @@
 # Copyright (c) 2019, 2021 by Delphix. All rights reserved.
 #
 
+import sys
+
 import mock
 import pytest
 import six
 
 from dlpx.virtualization.api import libs_pb2
-from dlpx.virtualization import libs
+from dlpx.virtualization.common._common_classes import RemoteHost
+from dlpx.virtualization import _engine, libs
+from dlpx.virtualization._engine import libs as engine_libs
+from dlpx.virtualization.libs import libs as libs_module
 from dlpx.virtualization.libs.exceptions import (
     IncorrectArgumentTypeError, LibraryError, PluginScriptError)
 from google.protobuf import json_format
@@ -51,6 +56,92 @@ class TestLibsRunBash:
         assert actual_run_bash_result.stdout == expected.stdout
         assert actual_run_bash_result.stderr == expected.stderr
 
+    @staticmethod
+    def test_run_bash_remote_connection(remote_connection):
+        response = libs_pb2.RunBashResponse()
+        response.return_value.exit_code = 0
+
+        def mock_run_bash(actual_run_bash_request):
+            assert (actual_run_bash_request.remote_connection ==
+                    remote_connection.to_proto())
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_bash',
+                        side_effect=mock_run_bash, create=True):
+            libs.run_bash(remote_connection, 'command')
+
+    @staticmethod
+    def test_run_bash_remote_connection_from_to_proto(remote_connection):
+        response = libs_pb2.RunBashResponse()
+        response.return_value.exit_code = 0
+        expected_connection = remote_connection.to_proto()
+        expected_connection.environment.host.name = 'other host'
+
+        def mock_run_bash(actual_run_bash_request):
+            assert (actual_run_bash_request.remote_connection ==
+                    expected_connection)
+            return response
+
+        with mock.patch.object(type(remote_connection), 'to_proto',
+                               return_value=expected_connection):
+            with mock.patch('dlpx.virtualization._engine.libs.run_bash',
+                            side_effect=mock_run_bash, create=True):
+                libs.run_bash(remote_connection, 'command')
+
+    @staticmethod
+    def test_run_bash_remote_connection_reused(remote_connection):
+        response = libs_pb2.RunBashResponse()
+        response.return_value.exit_code = 0
+        actual_connections = []
+
+        def mock_run_bash(actual_run_bash_request):
+            actual_connections.append(
+                actual_run_bash_request.remote_connection)
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_bash',
+                        side_effect=mock_run_bash, create=True):
+            libs.run_bash(remote_connection, 'command0')
+            libs.run_bash(remote_connection, 'command1')
+
+        assert actual_connections == [remote_connection.to_proto()] * 2
+
+    @staticmethod
+    def test_run_bash_remote_connection_new_host(remote_connection):
+        response = libs_pb2.RunBashResponse()
+        response.return_value.exit_code = 0
+        actual_hosts = []
+
+        def mock_run_bash(actual_run_bash_request):
+            actual_hosts.append(
+                actual_run_bash_request.remote_connection.environment.host.name)
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_bash',
+                        side_effect=mock_run_bash, create=True):
+            libs.run_bash(remote_connection, 'command0')
+            remote_connection.environment.host = RemoteHost(
+                'other host', 'other-host-reference', 'binary_path',
+                'scratch_path')
+            libs.run_bash(remote_connection, 'command1')
+
+        assert actual_hosts == ['host', 'other host']
+
+    @staticmethod
+    def test_run_bash_with_variables(remote_connection):
+        response = libs_pb2.RunBashResponse()
+        response.return_value.exit_code = 0
+
+        expected_variables = {'var0': 'val0', 'var1': 'val1'}
+
+        def mock_run_bash(actual_run_bash_request):
+            assert dict(actual_run_bash_request.variables) == expected_variables
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_bash',
+                        side_effect=mock_run_bash, create=True):
+            libs.run_bash(remote_connection, 'command', expected_variables)
+
     @staticmethod
     def test_run_bash_check_true_success_exitcode(remote_connection):
         expected_response = libs_pb2.RunBashResponse()
@@ -519,6 +610,21 @@ class TestLibsRunPowershell:
         assert actual_run_powershell_result.stdout == expected.stdout
         assert actual_run_powershell_result.stderr == expected.stderr
 
+    @staticmethod
+    def test_run_powershell_with_variables(remote_connection):
+        response = libs_pb2.RunPowerShellResponse()
+        response.return_value.exit_code = 0
+
+        expected_variables = {'var0': 'val0', 'var1': 'val1'}
+
+        def mock_run_powershell(actual_run_powershell_request):
+            assert dict(actual_run_powershell_request.variables) == expected_variables
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_powershell',
+                        side_effect=mock_run_powershell, create=True):
+            libs.run_powershell(remote_connection, 'command', expected_variables)
+
     @staticmethod
     def test_run_powershell_check_true_exitcode_success(remote_connection):
         expected_response = libs_pb2.RunPowerShellResponse()
@@ -715,6 +821,21 @@ class TestLibsRunExpect:
         assert actual_run_expect_result.stdout == expected.stdout
         assert actual_run_expect_result.stderr == expected.stderr
 
+    @staticmethod
+    def test_run_expect_with_variables(remote_connection):
+        response = libs_pb2.RunExpectResponse()
+        response.return_value.exit_code = 0
+
+        expected_variables = {'var0': 'val0', 'var1': 'val1'}
+
+        def mock_run_expect(actual_run_expect_request):
+            assert dict(actual_run_expect_request.variables) == expected_variables
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_expect',
+                        side_effect=mock_run_expect, create=True):
+            libs.run_expect(remote_connection, 'command', expected_variables)
+
     @staticmethod
     def test_run_expect_check_true_exitcode_success(remote_connection):
         expected_response = libs_pb2.RunPowerShellResponse()
@@ -878,6 +999,115 @@ class TestLibsRunExpect:
                     err_info.value.message == message.format('str', 'int'))
 
 
+class TestLibsRemoteShell:
+    @staticmethod
+    def test_bash(remote_connection):
+        actual_requests = []
+
+        def mock_run_bash(actual_run_bash_request):
+            # The request is reused between calls, so keep a copy of each.
+            actual_request = libs_pb2.RunBashRequest()
+            actual_request.CopyFrom(actual_run_bash_request)
+            actual_requests.append(actual_request)
+            response = libs_pb2.RunBashResponse()
+            response.return_value.exit_code = 0
+            response.return_value.stdout = actual_run_bash_request.command
+            return response
+
+        shell = libs.RemoteShell(remote_connection)
+        with mock.patch('dlpx.virtualization._engine.libs.run_bash',
+                        side_effect=mock_run_bash, create=True):
+            result0 = shell.bash('command0', {'var': 'val'}, True)
+            result1 = shell.bash('command1')
+
+        assert result0.stdout == 'command0'
+        assert result1.stdout == 'command1'
+        assert [(request.command, dict(request.variables),
+                 request.use_login_shell)
+                for request in actual_requests] == [
+            ('command0', {'var': 'val'}, True), ('command1', {}, False)]
+        for request in actual_requests:
+            assert (request.remote_connection ==
+                    remote_connection.to_proto())
+
+    @staticmethod
+    def test_bash_use_login_shell_none(remote_connection):
+        response = libs_pb2.RunBashResponse()
+        response.return_value.exit_code = 0
+
+        def mock_run_bash(actual_run_bash_request):
+            assert not actual_run_bash_request.use_login_shell
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_bash',
+                        side_effect=mock_run_bash, create=True):
+            libs.run_bash(remote_connection, 'command', use_login_shell=None)
+            libs.RemoteShell(remote_connection).bash(
+                'command', use_login_shell=None)
+
+    @staticmethod
+    def test_powershell(remote_connection):
+        response = libs_pb2.RunPowerShellResponse()
+        response.return_value.exit_code = 0
+        response.return_value.stdout = 'stdout'
+
+        def mock_run_powershell(actual_run_powershell_request):
+            assert actual_run_powershell_request.command == 'command'
+            assert (dict(actual_run_powershell_request.variables) ==
+                    {'var': 'val'})
+            assert (actual_run_powershell_request.remote_connection ==
+                    remote_connection.to_proto())
+            return response
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_powershell',
+                        side_effect=mock_run_powershell, create=True):
+            result = libs.RemoteShell(remote_connection).powershell(
+                'command', {'var': 'val'})
+
+        assert result.stdout == 'stdout'
+
+    @staticmethod
+    def test_expect_check_true_failed_exitcode(remote_connection):
+        response = libs_pb2.RunExpectResponse()
+        response.return_value.exit_code = 1
+
+        with mock.patch('dlpx.virtualization._engine.libs.run_expect',
+                        return_value=response, create=True):
+            with pytest.raises(PluginScriptError):
+                libs.RemoteShell(remote_connection).expect('command',
+                                                           check=True)
+
+    @staticmethod
+    def test_bad_remote_connection():
+        with pytest.raises(IncorrectArgumentTypeError) as err_info:
+            libs.RemoteShell('BadRemoteConnection')
+        if six.PY2:
+            assert err_info.value.message == (
+                "The function RemoteShell's argument 'remote_connection' was"
+                " type 'str' but should be of"
+                " class 'dlpx.virtualization.common._common_classes.RemoteConnection'.")
+        else:
+            assert err_info.value.message == (
+                "The function RemoteShell's argument 'remote_connection' was"
+                " class 'str' but should be of"
+                " class 'dlpx.virtualization.common._common_classes.RemoteConnection'.")
+
+    @staticmethod
+    def test_bash_bad_variables(remote_connection):
+        with pytest.raises(IncorrectArgumentTypeError) as err_info:
+            libs.RemoteShell(remote_connection).bash('command', 'not a dict')
+        if six.PY2:
+            assert err_info.value.message == (
+                "The function RemoteShell.bash's argument 'variables' was"
+                " type 'unicode' but should be of"
+                " type 'dict of basestring:basestring' if defined.")
+        else:
+            assert err_info.value.message == (
+                "The function RemoteShell.bash's argument 'variables' was"
+                " class 'str' but should be of"
+                " type 'dict of str:str' if defined.")
+
+
 class TestLibsRetrieveCredentials:
     @staticmethod
     def test_retrieve_password_credentials():
@@ -1054,3 +1284,19 @@ class TestLibsUpgradePassword:
             assert err_info.value.message == (
                 "The function upgrade_password's argument 'username' was"
                 " class 'int' but should be of class 'str' if defined.")
+
+
+class TestLibsGetInternalLibs:
+    @staticmethod
+    def test_imports_engine_libs():
+        with mock.patch.object(libs_module, '_engine', None), \
+                mock.patch.dict(sys.modules):
+            # Simulate a fresh runtime where the submodule is not imported yet.
+            del sys.modules['dlpx.virtualization._engine.libs']
+            del _engine.libs
+            try:
+                actual_internal_libs = libs_module._get_internal_libs()
+                assert (actual_internal_libs is
+                        sys.modules['dlpx.virtualization._engine.libs'])
+            finally:
+                _engine.libs = engine_libs
@@ -6,21 +6,56 @@ import logging
 import mock
 import pytest
 
-from dlpx.virtualization.libs import PlatformHandler
+from dlpx.virtualization.libs import (
+    AsyncPlatformHandler, BufferedPlatformHandler, PlatformHandler)
 from dlpx.virtualization.api.libs_pb2 import LogRequest
 from dlpx.virtualization.api.libs_pb2 import LogResult
 from dlpx.virtualization.api.libs_pb2 import LogResponse
 
 
-class TestPythonHandler:
+@pytest.fixture()
+def successful_response():
+    result = LogResult()
+    response = LogResponse()
+    response.return_value.CopyFrom(result)
+    return response
 
-    @staticmethod
-    @pytest.fixture()
-    def successful_response():
-        result = LogResult()
-        response = LogResponse()
-        response.return_value.CopyFrom(result)
-        return response
+
+@pytest.fixture()
+def logger():
+    logger = logging.getLogger('test_platform_handler')
+    logger.propagate = False
+    logger.setLevel(logging.NOTSET)
+    yield logger
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+
+@pytest.fixture()
+def actual_log_requests(successful_response):
+    actual_log_requests = []
+
+    def mock_log(log_request):
+        # The request is reused between calls, so keep a copy of each.
+        actual_log_request = LogRequest()
+        actual_log_request.CopyFrom(log_request)
+        actual_log_requests.append(actual_log_request)
+        return successful_response
+
+    with mock.patch("dlpx.virtualization._engine.libs.log",
+                    side_effect=mock_log, create=True):
+        yield actual_log_requests
+
+
+def _log_request(message, level):
+    log_request = LogRequest()
+    log_request.message = message
+    log_request.level = level
+    return log_request
+
+
+class TestPythonHandler:
 
     @staticmethod
     @pytest.mark.parametrize("py_level,expected_level", [
@@ -84,3 +119,109 @@ class TestPythonHandler:
         log_request.level = LogRequest.ERROR
 
         mock_internal_libs.log.assert_called_with(log_request)
+
+
+class TestBufferedPlatformHandler:
+
+    @staticmethod
+    @mock.patch("dlpx.virtualization._engine.libs", create=True)
+    def test_buffers_until_capacity(mock_internal_libs, successful_response,
+                                    logger):
+        mock_internal_libs.log.return_value = successful_response
+        logger.addHandler(BufferedPlatformHandler(capacity=3))
+
+        logger.info('first')
+        logger.info('second')
+        assert not mock_internal_libs.log.called
+
+        logger.info('third')
+
+        mock_internal_libs.log.assert_called_once_with(
+            _log_request('first\nsecond\nthird', LogRequest.INFO))
+
+    @staticmethod
+    def test_flush_level_splits_by_level(actual_log_requests, logger):
+        logger.addHandler(BufferedPlatformHandler())
+
+        logger.debug('debug one')
+        logger.debug('debug two')
+        logger.info('info')
+        logger.error('error')
+
+        assert actual_log_requests == [
+            _log_request('debug one\ndebug two', LogRequest.DEBUG),
+            _log_request('info', LogRequest.INFO),
+            _log_request('error', LogRequest.ERROR)
+        ]
+
+    @staticmethod
+    @mock.patch("dlpx.virtualization._engine.libs", create=True)
+    def test_flush_on_close(mock_internal_libs, successful_response, logger):
+        mock_internal_libs.log.return_value = successful_response
+        handler = BufferedPlatformHandler()
+        logger.addHandler(handler)
+
+        logger.info('Some message: %s', 'parameter')
+        assert not mock_internal_libs.log.called
+
+        handler.close()
+
+        mock_internal_libs.log.assert_called_once_with(
+            _log_request('Some message: parameter', LogRequest.INFO))
+
+    @staticmethod
+    def test_formats_when_logged(actual_log_requests, logger):
+        handler = BufferedPlatformHandler()
+        logger.addHandler(handler)
+        state = ['before']
+
+        logger.info('state %s', state)
+        state[0] = 'after'
+        handler.flush()
+
+        assert actual_log_requests == [
+            _log_request("state ['before']", LogRequest.INFO)
+        ]
+
+
+class TestAsyncPlatformHandler:
+
+    @staticmethod
+    def test_flush(actual_log_requests, logger):
+        handler = AsyncPlatformHandler()
+        logger.addHandler(handler)
+
+        logger.debug('Some message: %s', 'parameter')
+        logger.info('info')
+        handler.flush()
+
+        assert actual_log_requests == [
+            _log_request('Some message: parameter', LogRequest.DEBUG),
+            _log_request('info', LogRequest.INFO)
+        ]
+
+    @staticmethod
+    def test_error_logged_after_queued_records(actual_log_requests, logger):
+        logger.addHandler(AsyncPlatformHandler())
+
+        logger.info('info')
+        logger.error('error')
+
+        assert actual_log_requests == [
+            _log_request('info', LogRequest.INFO),
+            _log_request('error', LogRequest.ERROR)
+        ]
+
+    @staticmethod
+    def test_close_stops_thread(actual_log_requests, logger):
+        handler = AsyncPlatformHandler()
+        logger.addHandler(handler)
+
+        logger.info('info')
+        thread = handler._executor._thread
+        handler.close()
+
+        assert not thread.is_alive()
+        assert actual_log_requests == [
+            _log_request('info', LogRequest.INFO)
+        ]